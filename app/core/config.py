@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     db_name: str = "task_management"
     db_user: str = "root"
     db_password: str = "changeme"
+    db_echo_sql: bool = False
+    db_pool_size: int = 25
+    db_max_overflow: int = 25
+    db_pool_recycle: int = 1800
+    db_pool_timeout: int = 5
 
     # ─── App ──────────────────────────────────────────
     app_env: str = "development"
@@ -1,7 +1,14 @@
 """Database configuration and session management."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
@@ -14,16 +21,18 @@ class Base(DeclarativeBase):
 # Create async engine with connection pooling
 engine = create_async_engine(
     settings.database_url,
-    echo=settings.app_debug,
+    echo=settings.db_echo_sql,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,  # Stay below MySQL's wait_timeout
+    pool_timeout=settings.db_pool_timeout,
+    connect_args={"charset": "utf8mb4", "autocommit": False},
 )
 
 # Session factory
-async_session_factory = sessionmaker(
+async_session_factory = async_sessionmaker(
     bind=engine,
-    class_=AsyncSession,
     expire_on_commit=False,
 )
 
@@ -32,13 +41,16 @@ async def get_db() -> AsyncSession:
     """
     Dependency for FastAPI that provides an async database session per request.
     
+    Writes are committed by the service inside an explicit transaction,
+    so the session is never committed here; it is only rolled back on error
+    and closed on exit.
+    
     Yields:
         AsyncSession: Database session
     """
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -48,8 +60,26 @@ async def init_db() -> None:
     """
     Initialize database by creating all tables.
     
-    Note: In production, this should be handled by migrations.
-    For this project, we'll use the init.sql script in Docker.
+    Only runs in development; in other environments the schema is managed
+    by the init.sql script in Docker (or migrations), so startup skips the
+    table inspection round-trips entirely.
     """
+    if settings.app_env != "development":
+        return
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_up_pool() -> None:
+    """
+    Open every pooled connection up front with a trivial query.
+    
+    Moves the TCP handshake and authentication cost of filling the pool
+    to startup, so the first requests do not pay it.
+    """
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*[ping() for _ in range(engine.pool.size())])
@@ -4,8 +4,9 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-from app.core.database import init_db
+from app.core.database import init_db, warm_up_pool
 from app.routers import tasks
 
 # ─── Logging Configuration ────────────────────────────────────────────────────
@@ -21,8 +22,9 @@ logging.basicConfig(
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
+    """Initialize database and pre-fill the connection pool on startup."""
     await init_db()
+    await warm_up_pool()
     yield
 
 
@@ -33,6 +35,7 @@ app = FastAPI(
     description="REST API for managing tasks with MySQL and FastAPI",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Include routers
@@ -1,26 +1,22 @@
 """Task model for the task management system."""
 
-from datetime import datetime, timezone
-
-from sqlalchemy import Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.schemas.task import TaskStatusEnum
 
 
-class TaskStatus(str):
-    """Allowed values for task status."""
-
-    PENDING = "pending"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
+# Single source of truth for status values, shared with the API schemas
+TaskStatus = TaskStatusEnum
 
 
-# Enum for SQLAlchemy
+# Enum for SQLAlchemy (stores the enum values, loads enum members)
 task_status_enum = Enum(
-    "pending",
-    "in_progress",
-    "completed",
+    TaskStatusEnum,
     name="task_status",
+    native_enum=True,
+    values_callable=lambda enum_cls: [member.value for member in enum_cls],
 )
 
 
@@ -48,7 +44,6 @@ class Task(Base):
         task_status_enum,
         nullable=False,
         default=TaskStatus.PENDING,
-        index=True,
     )
     priority = Column(
         Integer,
@@ -58,11 +53,24 @@ class Task(Base):
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
     updated_at = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
     )
+
+    # Matches the list query (WHERE status = ? ORDER BY created_at DESC,
+    # id DESC) so filtered pages are read in index order without a filesort;
+    # id is spelled out because InnoDB would append the PK ascending
+    __table_args__ = (
+        Index(
+            "ix_tasks_status_created_at", status, created_at.desc(), id.desc()
+        ),
+    )
+
+    # Load the database-stamped timestamps during the flush, so they are
+    # available without a lazy load (RETURNING where the backend supports it)
+    __mapper_args__ = {"eager_defaults": True}
@@ -1,9 +1,10 @@
 """Repository layer for task data access."""
 
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import func, select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
 
 from app.models.task import Task, TaskStatus
 
@@ -14,14 +15,23 @@ class TaskRepository:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
+    # ─── Transaction ───────────────────────────────────────────────────
+
+    def transaction(self) -> AsyncSessionTransaction:
+        """
+        Begin a transaction on the underlying session.
+        
+        Use as ``async with repo.transaction():``; it commits on exit and
+        rolls back if the block raises.
+        """
+        return self._db.begin()
+
     # ─── Read ──────────────────────────────────────────────────────────
 
     async def get_by_id(self, task_id: int) -> Optional[Task]:
         """Get a task by its ID."""
-        result = await self._db.execute(
-            select(Task).where(Task.id == task_id)
-        )
-        return result.scalar_one_or_none()
+        # Served from the identity map when the task is already loaded
+        return await self._db.get(Task, task_id)
 
     async def get_all(
         self,
@@ -29,28 +39,53 @@ class TaskRepository:
         skip: int = 0,
         limit: int = 10,
         status_filter: Optional[str] = None,
+        cursor: Optional[tuple[datetime, int]] = None,
     ) -> tuple[list[Task], int]:
         """
         Get all tasks with pagination and optional status filtering.
         
+        When ``cursor`` is given, keyset pagination is used: only tasks
+        strictly after the ``(created_at, id)`` pair are returned and
+        ``skip`` is ignored.
+        
         Returns:
             Tuple of (list of tasks, total count)
         """
-        query = select(Task)
         count_query = select(func.count()).select_from(Task)
+        if status_filter:
+            count_query = count_query.where(Task.status == status_filter)
+
+        if cursor is None:
+            # Fetch the page and the total in a single round-trip using a
+            # window function instead of a separate COUNT(*) query
+            query = select(Task, func.count().over().label("total"))
+        else:
+            # The cursor predicate would narrow a window count, so the total
+            # comes from an uncorrelated subquery in the same statement
+            query = select(Task, count_query.scalar_subquery().label("total"))
+            query = query.where(tuple_(Task.created_at, Task.id) < cursor)
 
         if status_filter:
             query = query.where(Task.status == status_filter)
-            count_query = count_query.where(Task.status == status_filter)
 
-        # Get total count
-        count_result = await self._db.execute(count_query)
-        total = count_result.scalar() or 0
+        query = query.order_by(Task.created_at.desc(), Task.id.desc())
+        if cursor is None:
+            query = query.offset(skip)
+        query = query.limit(limit)
 
-        # Apply pagination and ordering
-        query = query.order_by(Task.created_at.desc()).offset(skip).limit(limit)
         result = await self._db.execute(query)
-        tasks = list(result.scalars().all())
+        rows = result.all()
+
+        if rows:
+            total = rows[0].total
+        elif skip > 0 or limit <= 0 or cursor is not None:
+            # Empty page that does not prove the table is empty (past the end
+            # or limit=0): no rows carry the total, so count
+            total = (await self._db.execute(count_query)).scalar() or 0
+        else:
+            total = 0
+
+        tasks = [row.Task for row in rows]
 
         return tasks, total
 
@@ -60,7 +95,6 @@ class TaskRepository:
         """Create a new task."""
         self._db.add(task)
         await self._db.flush()
-        await self._db.refresh(task)
         return task
 
     # ─── Update ────────────────────────────────────────────────────────
@@ -68,23 +102,21 @@ class TaskRepository:
     async def update(self, task: Task) -> Task:
         """Update an existing task."""
         await self._db.flush()
-        await self._db.refresh(task)
         return task
 
-    async def update_status(self, task_id: int, status: str) -> bool:
+    async def update_status_many(self, task_ids: list[int], status: str) -> int:
         """
-        Update task status by ID.
+        Update the status of several tasks with a single UPDATE statement.
         
         Returns:
-            True if task was updated, False if task not found
+            Number of tasks that were updated
         """
         result = await self._db.execute(
             update(Task)
-            .where(Task.id == task_id)
+            .where(Task.id.in_(task_ids))
             .values(status=status)
         )
-        await self._db.flush()
-        return result.rowcount > 0
+        return result.rowcount
 
     # ─── Delete ────────────────────────────────────────────────────────
 
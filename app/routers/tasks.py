@@ -4,6 +4,7 @@ import logging
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -16,7 +17,12 @@ from app.schemas.task import (
     TaskResponse,
     TaskUpdate,
 )
-from app.services.task_service import TaskNotFoundException, TaskService
+from app.services.task_service import (
+    InvalidCursorException,
+    TaskNotFoundException,
+    TaskService,
+    encode_cursor,
+)
 
 router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
 logger = logging.getLogger(__name__)
@@ -25,7 +31,7 @@ logger = logging.getLogger(__name__)
 # ─── Dependency: Service instance per request ────────────────────────────────
 
 
-def get_task_service(db: AsyncSession = Depends(get_db)) -> TaskService:
+async def get_task_service(db: AsyncSession = Depends(get_db)) -> TaskService:
     """Dependency that provides a TaskService instance."""
     repo = TaskRepository(db)
     return TaskService(repo)
@@ -51,28 +57,58 @@ async def create_task(
 
 @router.get(
     "/",
-    response_model=TaskListResponse,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": TaskListResponse}},
     summary="List tasks",
-    description="List tasks with pagination and optional status filtering.",
+    description=(
+        "List tasks with pagination and optional status filtering. "
+        "Pass the returned 'next_cursor' as 'cursor' for keyset pagination; "
+        "'skip' is ignored when a cursor is given."
+    ),
 )
 async def list_tasks(
     skip: int = 0,
     limit: int = 10,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
     service: TaskService = Depends(get_task_service),
 ):
     """List tasks with pagination and optional status filtering."""
-    tasks, total = await service.list_tasks(
-        skip=skip,
-        limit=limit,
-        status=status,
-    )
-    return TaskListResponse(
-        total=total,
-        skip=skip,
-        limit=limit,
-        tasks=tasks,
-    )
+    try:
+        tasks, total = await service.list_tasks(
+            skip=skip,
+            limit=limit,
+            status=status,
+            cursor=cursor,
+        )
+    except InvalidCursorException as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=str(exc),
+        )
+
+    # Build the payload directly from the ORM rows and let orjson encode it,
+    # skipping Pydantic validation and jsonable_encoder for every row
+    return ORJSONResponse({
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "tasks": [
+            {
+                "id": task.id,
+                "title": task.title,
+                "description": task.description,
+                "status": task.status,
+                "priority": task.priority,
+                "created_at": task.created_at,
+                "updated_at": task.updated_at,
+            }
+            for task in tasks
+        ],
+        "next_cursor": (
+            encode_cursor(tasks[-1]) if tasks and len(tasks) == limit else None
+        ),
+    })
 
 
 @router.get(
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PositiveInt
 
 
 # ─── Enums ──────────────────────────────────────────────────────────────────
@@ -50,17 +50,8 @@ class TaskUpdate(BaseModel):
 class BatchProcessRequest(BaseModel):
     """Schema for batch processing request."""
 
-    task_ids: list[int] = Field(..., min_length=1, description="List of task IDs to process")
-
-    @field_validator("task_ids")
-    @classmethod
-    def validate_task_ids(cls, v: list[int]) -> list[int]:
-        """Validate that task IDs are positive integers."""
-        if not v:
-            raise ValueError("task_ids cannot be empty")
-        if any(task_id <= 0 for task_id in v):
-            raise ValueError("All task IDs must be positive integers")
-        return v
+    # Positivity is checked per item by pydantic-core while parsing the list
+    task_ids: list[PositiveInt] = Field(..., min_length=1, description="List of task IDs to process")
 
 
 # ─── Response Schemas ────────────────────────────────────────────────────────
@@ -87,6 +78,10 @@ class TaskListResponse(BaseModel):
     skip: int
     limit: int
     tasks: list[TaskResponse]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, or null on the last page",
+    )
 
 
 class BatchProcessResponse(BaseModel):
@@ -1,8 +1,10 @@
 """Service layer for task business logic."""
 
 import asyncio
+import base64
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
 
 from app.core.database import async_session_factory
 from app.models.task import Task, TaskStatus
@@ -20,14 +22,43 @@ class TaskNotFoundException(Exception):
     pass
 
 
+class InvalidCursorException(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+# ─── Pagination Cursor ───────────────────────────────────────────────────────
+
+
+def encode_cursor(task: Task) -> str:
+    """Encode the keyset position of a task as an opaque cursor string."""
+    raw = f"{task.created_at.isoformat()}|{task.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor into (created_at, id)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, task_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(task_id)
+    except ValueError as exc:
+        raise InvalidCursorException(f"Invalid cursor '{cursor}'.") from exc
+
+
 # ─── Service ────────────────────────────────────────────────────────────────
 
 
 class TaskService:
     """Service containing business logic for tasks."""
 
-    def __init__(self, repository: TaskRepository) -> None:
+    def __init__(
+        self,
+        repository: TaskRepository,
+        sleeper: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
         self._repo = repository
+        self._sleep = sleeper
 
     # ─── Create ──────────────────────────────────────────────────────
 
@@ -39,7 +70,8 @@ class TaskService:
             status=TaskStatus.PENDING,
             priority=data.priority,
         )
-        return await self._repo.create(task)
+        async with self._repo.transaction():
+            return await self._repo.create(task)
 
     # ─── Read ────────────────────────────────────────────────────────
 
@@ -56,37 +88,41 @@ class TaskService:
         skip: int = 0,
         limit: int = 10,
         status: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> tuple[list[Task], int]:
         """List tasks with pagination and optional status filtering."""
         return await self._repo.get_all(
             skip=skip,
             limit=limit,
             status_filter=status,
+            cursor=decode_cursor(cursor) if cursor else None,
         )
 
     # ─── Update ──────────────────────────────────────────────────────
 
     async def update_task(self, task_id: int, data: TaskUpdate) -> Task:
         """Update an existing task."""
-        task = await self.get_task(task_id)
+        async with self._repo.transaction():
+            task = await self.get_task(task_id)
 
-        if data.title is not None:
-            task.title = data.title
-        if data.description is not None:
-            task.description = data.description
-        if data.status is not None:
-            task.status = data.status.value
-        if data.priority is not None:
-            task.priority = data.priority
+            if data.title is not None:
+                task.title = data.title
+            if data.description is not None:
+                task.description = data.description
+            if data.status is not None:
+                task.status = data.status
+            if data.priority is not None:
+                task.priority = data.priority
 
-        return await self._repo.update(task)
+            return await self._repo.update(task)
 
     # ─── Delete ────────────────────────────────────────────────────────
 
     async def delete_task(self, task_id: int) -> None:
         """Delete a task."""
-        task = await self.get_task(task_id)
-        await self._repo.delete(task)
+        async with self._repo.transaction():
+            task = await self.get_task(task_id)
+            await self._repo.delete(task)
 
     # ─── Batch Processing ────────────────────────────────────────────────
 
@@ -99,53 +135,46 @@ class TaskService:
         - Updates status to 'completed'
         - Handles errors gracefully
         
-        Each task uses its own database session to avoid concurrent operation errors.
+        The simulated processing runs concurrently for all tasks; the status
+        change is then applied with a single UPDATE on one dedicated session,
+        instead of one session and one transaction per task.
         
         Returns:
             Number of successfully processed tasks
         """
-        async def process_single_task(task_id: int) -> bool:
-            """Process a single task, returning True if successful."""
-            # Create a new database session for this task
-            async with async_session_factory() as session:
-                try:
-                    # Simulate processing time
-                    await asyncio.sleep(2)
-                    
-                    # Create a new repository with the new session
-                    repo = TaskRepository(session)
-                    
-                    # Update task status to completed
-                    updated = await repo.update_status(
-                        task_id,
-                        TaskStatus.COMPLETED
-                    )
-                    
-                    # Commit the transaction
-                    await session.commit()
-                    
-                    if updated:
-                        logger.info(f"Task {task_id} processed successfully")
-                        return True
-                    else:
-                        logger.warning(f"Task {task_id} not found")
-                        return False
-                except Exception as e:
-                    # Rollback on error
-                    await session.rollback()
-                    logger.error(f"Error processing task {task_id}: {e}")
-                    return False
-
-        # Process all tasks concurrently using asyncio.gather
-        results = await asyncio.gather(
-            *[process_single_task(task_id) for task_id in task_ids],
-            return_exceptions=True
-        )
+        async def process_single_task(task_id: int) -> None:
+            """Simulate the processing time of a single task."""
+            await self._sleep(2)
 
-        # Count successful processing (True values, excluding exceptions)
-        processed_count = sum(
-            1 for result in results
-            if result is True
+        # Simulate processing of all tasks concurrently using asyncio.gather
+        await asyncio.gather(
+            *[process_single_task(task_id) for task_id in task_ids]
         )
 
+        unique_ids = list(dict.fromkeys(task_ids))
+
+        # The session (and its pooled connection) is only opened once the
+        # simulated processing is done, so no connection is held while sleeping
+        async with async_session_factory() as session:
+            try:
+                repo = TaskRepository(session)
+
+                # Update all task statuses to completed in one statement
+                processed_count = await repo.update_status_many(
+                    unique_ids,
+                    TaskStatus.COMPLETED,
+                )
+
+                await session.commit()
+            except Exception as e:
+                # Rollback on error
+                await session.rollback()
+                logger.error(f"Error processing tasks {unique_ids}: {e}")
+                return 0
+
+        missing = len(unique_ids) - processed_count
+        if missing:
+            logger.warning(f"{missing} of {len(unique_ids)} tasks not found")
+        logger.info(f"{processed_count} tasks processed successfully")
+
         return processed_count
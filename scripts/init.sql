@@ -13,7 +13,7 @@ CREATE TABLE IF NOT EXISTS tasks (
     priority INT NOT NULL DEFAULT 3,
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX idx_status (status),
+    INDEX idx_status_created_at (status, created_at DESC, id DESC),
     INDEX idx_title (title),
     INDEX idx_created_at (created_at),
     CONSTRAINT chk_priority CHECK (priority >= 1 AND priority <= 5)
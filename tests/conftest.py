@@ -1,37 +1,62 @@
 """Pytest configuration and shared fixtures."""
 
-import os
-import tempfile
-import atexit
+import asyncio
 
 import pytest
 import pytest_asyncio
+from fastapi import Depends
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.functions import now
+
+# ─── Test Database Setup (in-memory SQLite) ─────────────────────────────────
+# Every session, including the ones opened by batch processing, runs on the
+# single per-test connection, so one in-memory database kept alive by
+# StaticPool is enough. Each pytest-xdist worker process gets its own.
+
+TEST_DB_URL = "sqlite+aiosqlite://"
+
+
+# SQLite's CURRENT_TIMESTAMP has second precision and a different text format
+# than SQLAlchemy's DATETIME storage, which breaks ordering/keyset comparisons
+# against bound datetimes. Stamp rows in the storage format instead.
+@compiles(now, "sqlite")
+def sqlite_now(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+test_engine = create_async_engine(
+    TEST_DB_URL,
+    echo=False,
+    poolclass=StaticPool,
+)
 
-# ─── Test Database Setup (SQLite file for concurrent access) ────────────────
-# Using file instead of :memory: to allow concurrent sessions in batch processing
 
-# Create temporary database file
-test_db_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-test_db_file.close()
-TEST_DB_URL = f"sqlite+aiosqlite:///{test_db_file.name}"
+# The sqlite driver manages transactions itself and breaks SAVEPOINTs; let
+# SQLAlchemy emit BEGIN so per-test savepoints behave as on MySQL
+@event.listens_for(test_engine.sync_engine, "connect")
+def disable_driver_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
 
-# Clean up temp file on exit
-def cleanup_test_db():
-    try:
-        os.remove(test_db_file.name)
-    except:
-        pass
 
-atexit.register(cleanup_test_db)
+@event.listens_for(test_engine.sync_engine, "begin")
+def emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
 
-test_engine = create_async_engine(TEST_DB_URL, echo=False)
-TestSessionFactory = sessionmaker(
+
+# Bound per test to a connection inside an outer transaction; session
+# commits only release a SAVEPOINT, so everything is rolled back afterwards
+TestSessionFactory = async_sessionmaker(
     bind=test_engine,
-    class_=AsyncSession,
     expire_on_commit=False,
+    join_transaction_mode="create_savepoint",
 )
 
 # Override async_session_factory BEFORE importing app modules
@@ -42,6 +67,9 @@ database.async_session_factory = TestSessionFactory
 from app.core.database import Base, get_db
 from app.main import app
 from app.models.task import Task, TaskStatus
+from app.repositories.task_repository import TaskRepository
+from app.routers.tasks import get_task_service
+from app.services.task_service import TaskService
 
 
 # ─── Override get_db dependency ──────────────────────────────────────────────
@@ -51,7 +79,6 @@ async def override_get_db():
     async with TestSessionFactory() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -60,24 +87,51 @@ async def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 
 
+# ─── Override get_task_service dependency ────────────────────────────────────
+
+async def skip_sleep(delay: float) -> None:
+    """Stand-in for the simulated processing delay that only yields control."""
+    await asyncio.sleep(0)
+
+
+async def override_get_task_service(
+    db: AsyncSession = Depends(get_db),
+) -> TaskService:
+    """Override service dependency so batch processing skips the 2 s delay."""
+    return TaskService(TaskRepository(db), sleeper=skip_sleep)
+
+
+app.dependency_overrides[get_task_service] = override_get_task_service
+
+
 # ─── Fixtures ────────────────────────────────────────────────────────────────
 
-@pytest_asyncio.fixture(autouse=True)
+def pytest_collection_modifyitems(items):
+    """Run every async test in the session event loop shared by the fixtures."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest_asyncio.fixture(scope="session")
 async def setup_db():
-    """Create tables before each test and drop them after."""
-    # Drop all tables first to ensure clean state
+    """Create tables once for the whole test session."""
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
-    # Create tables
-    async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
-    # Clean up after test - delete all data
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    # Also clear the file content by recreating tables
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await test_engine.dispose()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def db_connection(setup_db):
+    """Wrap each test in a transaction that is rolled back afterwards."""
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        TestSessionFactory.configure(bind=conn)
+        yield conn
+        await trans.rollback()
 
 
 @pytest.fixture
@@ -86,9 +140,11 @@ def anyio_backend():
     return "asyncio"
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 async def client():
-    """HTTP client for testing FastAPI endpoints."""
+    """HTTP client for testing FastAPI endpoints, shared across tests."""
+    # ASGITransport does not run the app lifespan: its startup work (create_all
+    # and pool warm-up) targets the MySQL engine, and setup_db covers the schema
     transport = ASGITransport(app=app)
     async with AsyncClient(
         transport=transport,
@@ -114,13 +170,26 @@ async def seed_task(
     priority: int = 3,
 ) -> Task:
     """Helper function to create a test task in the database."""
-    task = Task(
-        title=title,
-        description=description,
-        status=status,
-        priority=priority,
+    # INSERT ... RETURNING loads the row in the same statement, without
+    # unit-of-work flush bookkeeping or a refresh SELECT
+    result = await db.execute(
+        insert(Task)
+        .values(
+            title=title,
+            description=description,
+            status=status,
+            priority=priority,
+        )
+        .returning(Task)
     )
-    db.add(task)
+    task = result.scalar_one()
     await db.commit()
-    await db.refresh(task)
     return task
+
+
+async def seed_tasks(db: AsyncSession, specs: list[dict]) -> list[Task]:
+    """Helper function to create several test tasks in a single commit."""
+    tasks = [Task(**spec) for spec in specs]
+    db.add_all(tasks)
+    await db.commit()
+    return tasks
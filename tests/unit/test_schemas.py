@@ -38,13 +38,11 @@ class TestTaskCreate:
         with pytest.raises(ValidationError):
             TaskCreate(title=long_title)
 
-    def test_task_create_priority_out_of_range(self):
+    @pytest.mark.parametrize("priority", [0, 6, -1, 100])
+    def test_task_create_priority_out_of_range(self, priority):
         """Test that priority outside 1-5 range is rejected."""
         with pytest.raises(ValidationError):
-            TaskCreate(title="Test", priority=0)
-        
-        with pytest.raises(ValidationError):
-            TaskCreate(title="Test", priority=6)
+            TaskCreate.model_validate({"title": "Test", "priority": priority})
 
 
 class TestTaskUpdate:
@@ -83,10 +81,8 @@ class TestBatchProcessRequest:
         with pytest.raises(ValidationError):
             BatchProcessRequest(task_ids=[])
 
-    def test_batch_process_request_invalid_ids(self):
+    @pytest.mark.parametrize("task_ids", [[0, 1, 2], [-1, 1]])
+    def test_batch_process_request_invalid_ids(self, task_ids):
         """Test that negative or zero task IDs are rejected."""
         with pytest.raises(ValidationError):
-            BatchProcessRequest(task_ids=[0, 1, 2])
-        
-        with pytest.raises(ValidationError):
-            BatchProcessRequest(task_ids=[-1, 1])
+            BatchProcessRequest.model_validate({"task_ids": task_ids})
@@ -1,11 +1,14 @@
 """Unit tests for TaskService business logic."""
 
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.models.task import Task, TaskStatus
+from app.models.task import TaskStatus
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.services import task_service
 from app.services.task_service import TaskNotFoundException, TaskService
 
 
@@ -17,50 +20,86 @@ def make_task(
     title: str = "Test Task",
     status: str = TaskStatus.PENDING,
     priority: int = 3,
-) -> Task:
-    """Create a mock Task object for testing."""
-    task = MagicMock(spec=Task)
-    task.id = task_id
-    task.title = title
-    task.description = None
-    task.status = status
-    task.priority = priority
-    return task
+) -> SimpleNamespace:
+    """Create a lightweight stand-in for a Task object for testing."""
+    return SimpleNamespace(
+        id=task_id,
+        title=title,
+        description=None,
+        status=status,
+        priority=priority,
+    )
+
+
+# ─── Helper: Stub repository ────────────────────────────────────────────────
+
+class StubRepo:
+    """Hand-rolled async stand-in for TaskRepository that records its calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self.returns: dict = {}
+
+    def call_names(self) -> list[str]:
+        """Return the names of the recorded calls, in order."""
+        return [call[0] for call in self.calls]
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.calls.append(("transaction",))
+        yield
+
+    async def create(self, task):
+        self.calls.append(("create", task))
+        return self.returns.get("create", task)
+
+    async def get_by_id(self, task_id):
+        self.calls.append(("get_by_id", task_id))
+        return self.returns.get("get_by_id")
+
+    async def update(self, task):
+        self.calls.append(("update", task))
+        return self.returns.get("update", task)
+
+    async def delete(self, task):
+        self.calls.append(("delete", task))
+
+    async def update_status_many(self, task_ids, status):
+        self.calls.append(("update_status_many", task_ids, status))
+        return self.returns.get("update_status_many", len(task_ids))
 
 
 # ─── Fixtures ────────────────────────────────────────────────────────────────
 
 @pytest.fixture
-def mock_repo():
-    """Create a mock repository."""
-    return AsyncMock()
+def repo() -> StubRepo:
+    """Create a stub repository."""
+    return StubRepo()
 
 
 @pytest.fixture
-def service(mock_repo) -> TaskService:
-    """Create a TaskService instance with mocked repository."""
-    return TaskService(repository=mock_repo)
+def service(repo) -> TaskService:
+    """Create a TaskService instance with a stub repository."""
+    return TaskService(repository=repo)
 
 
 # ─── Tests: Create ───────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
 class TestCreateTask:
     """Tests for creating tasks."""
 
-    async def test_create_task_with_default_status(self, service, mock_repo):
+    async def test_create_task_with_default_status(self, service, repo):
         """Test that created tasks have status 'pending' by default."""
-        mock_repo.create.return_value = make_task(status=TaskStatus.PENDING)
-
-        data = TaskCreate(
+        data = TaskCreate.model_construct(
             title="New Task",
             description="Description",
             priority=4,
         )
         result = await service.create_task(data)
 
-        mock_repo.create.assert_awaited_once()
-        created_task = mock_repo.create.call_args[0][0]
+        assert repo.call_names() == ["transaction", "create"]
+        created_task = repo.calls[1][1]
+        assert result is created_task
         assert created_task.status == TaskStatus.PENDING
         assert created_task.title == "New Task"
         assert created_task.priority == 4
@@ -68,75 +107,100 @@ class TestCreateTask:
 
 # ─── Tests: Get ──────────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
 class TestGetTask:
     """Tests for getting tasks."""
 
-    async def test_get_existing_task(self, service, mock_repo):
+    async def test_get_existing_task(self, service, repo):
         """Test getting an existing task."""
         task = make_task(task_id=1)
-        mock_repo.get_by_id.return_value = task
+        repo.returns["get_by_id"] = task
 
         result = await service.get_task(1)
         assert result == task
-        mock_repo.get_by_id.assert_awaited_once_with(1)
+        assert repo.calls == [("get_by_id", 1)]
 
-    async def test_get_nonexistent_task_raises_exception(self, service, mock_repo):
+    async def test_get_nonexistent_task_raises_exception(self, service, repo):
         """Test that getting a non-existent task raises exception."""
-        mock_repo.get_by_id.return_value = None
-
         with pytest.raises(TaskNotFoundException):
             await service.get_task(999)
 
 
 # ─── Tests: Update ──────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
 class TestUpdateTask:
     """Tests for updating tasks."""
 
-    async def test_update_task_fields(self, service, mock_repo):
+    async def test_update_task_fields(self, service, repo):
         """Test updating task fields."""
         task = make_task(task_id=1, title="Old Title")
-        mock_repo.get_by_id.return_value = task
-        mock_repo.update.return_value = task
+        repo.returns["get_by_id"] = task
 
-        data = TaskUpdate(
+        data = TaskUpdate.model_construct(
             title="New Title",
             priority=5,
         )
         result = await service.update_task(1, data)
 
+        assert result is task
         assert task.title == "New Title"
         assert task.priority == 5
-        mock_repo.update.assert_awaited_once()
+        assert repo.call_names() == ["transaction", "get_by_id", "update"]
 
-    async def test_update_nonexistent_task_raises_exception(self, service, mock_repo):
+    async def test_update_nonexistent_task_raises_exception(self, service, repo):
         """Test that updating a non-existent task raises exception."""
-        mock_repo.get_by_id.return_value = None
-
         with pytest.raises(TaskNotFoundException):
-            await service.update_task(999, TaskUpdate(title="New Title"))
+            await service.update_task(999, TaskUpdate.model_construct(title="New Title"))
 
 
 # ─── Tests: Delete ─────────────────────────────────────────────────────────
 
-@pytest.mark.asyncio
 class TestDeleteTask:
     """Tests for deleting tasks."""
 
-    async def test_delete_existing_task(self, service, mock_repo):
+    async def test_delete_existing_task(self, service, repo):
         """Test deleting an existing task."""
         task = make_task(task_id=1)
-        mock_repo.get_by_id.return_value = task
+        repo.returns["get_by_id"] = task
 
         await service.delete_task(1)
 
-        mock_repo.delete.assert_awaited_once_with(task)
+        assert repo.calls[-1] == ("delete", task)
 
-    async def test_delete_nonexistent_task_raises_exception(self, service, mock_repo):
+    async def test_delete_nonexistent_task_raises_exception(self, service, repo):
         """Test that deleting a non-existent task raises exception."""
-        mock_repo.get_by_id.return_value = None
-
         with pytest.raises(TaskNotFoundException):
             await service.delete_task(999)
+
+
+# ─── Tests: Batch Processing ────────────────────────────────────────────────
+
+class TestProcessTaskBatch:
+    """Tests for batch processing of tasks."""
+
+    async def test_session_opened_after_processing(self, repo, monkeypatch):
+        """Test that no database session is held during simulated processing."""
+        events = []
+
+        async def fake_sleep(delay):
+            events.append("sleep")
+
+        service = TaskService(repository=repo, sleeper=fake_sleep)
+
+        session = AsyncMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.side_effect = (
+            lambda: events.append("session") or session
+        )
+        batch_repo = StubRepo()
+
+        monkeypatch.setattr(task_service, "async_session_factory", session_factory)
+        monkeypatch.setattr(task_service, "TaskRepository", lambda db: batch_repo)
+
+        result = await service.process_task_batch([1, 2, 3])
+
+        assert result == 3
+        assert events == ["sleep", "sleep", "sleep", "session"]
+        assert batch_repo.calls == [
+            ("update_status_many", [1, 2, 3], TaskStatus.COMPLETED)
+        ]
+        session.commit.assert_awaited_once()